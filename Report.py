@@ -7,41 +7,158 @@ Analyzes exported WordPress data and generates a human-readable summary report.
 Adapted from gut0leao/wp-json-scraper
 """
 
+import io
 import json
+import os
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import starmap
 from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import simdjson
+
+        _json_loads = simdjson.loads
+    except ImportError:
+        _json_loads = json.loads
+
+# Per-item report line templates, bound once at import
+_TREE_LINE = "{}📂 {}\n".format
+_CATEGORY_COUNT_LINE = "  {}: {} post(s)\n".format
+_CATEGORY_HEADING = "  📂 {}:\n".format
+_POST_LINE = "    - 📝 {}\n".format
+_PAGE_LINE = "  📄 {}\n".format
+_MEDIA_LINES = "  🖼️  {}\n     URL: {}\n".format
+_MEDIA_LINES_WITH_TYPE = "  🖼️  {}\n     Type: {}\n     URL: {}\n".format
+_USER_LINE = "  👤 {} [{} post(s)]\n".format
 
 
 def load_json(path):
     """Load JSON file if it exists, return None otherwise"""
-    path_obj = Path(path)
-    if path_obj.exists():
-        with path_obj.open(encoding="utf-8") as f:
-            return json.load(f)
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    return _json_loads(data)
+
+
+def load_first_json(*paths):
+    """Load the first of the given JSON files that exists"""
+    for path in paths:
+        data = load_json(path)
+        if data is not None:
+            return data
     return None
 
 
-def tree_categories(categories, parent=0, prefix=""):
-    """Build a hierarchical tree structure of categories"""
-    tree = ""
-    children = [cat for cat in categories if cat.get("parent", 0) == parent]
-    for cat in children:
-        tree += f"{prefix}📂 {cat.get('name', '')}\n"
-        tree += tree_categories(categories, cat.get("id", 0), prefix + "    ")
-    return tree
+def load_exports(export_dir):
+    """
+    Load every export file, in parallel when more than one CPU is available
+    """
+    sources = {
+        "info": (export_dir / "info.json",),
+        "categories": (export_dir / "categories.json",),
+        "tags": (export_dir / "tags.json",),
+        # Try both locations for posts/pages (in subdirs or at root)
+        "posts": (export_dir / "posts" / "posts.json", export_dir / "posts.json"),
+        "pages": (export_dir / "pages" / "pages.json", export_dir / "pages.json"),
+        "media": (export_dir / "media.json",),
+        "users": (export_dir / "users.json",),
+    }
+    if (os.cpu_count() or 1) < 2:
+        return {key: load_first_json(*paths) for key, paths in sources.items()}
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = {
+            key: pool.submit(load_first_json, *paths) for key, paths in sources.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+def rendered(item, field, default=""):
+    """Return the rendered text of a WordPress field such as title or guid"""
+    value = item.get(field)
+    if isinstance(value, dict):
+        return value.get("rendered", default)
+    return default if value is None else value
+
+
+class MediaFile(NamedTuple):
+    """The fields of a media export entry listed in the report"""
+
+    name: str
+    mime_type: str
+    url: str
+
+    @classmethod
+    def from_json(cls, media):
+        """Build a MediaFile from a media object of the WordPress API"""
+        return cls(
+            rendered(media, "title", "Unnamed"),
+            media.get("mime_type", ""),
+            media["source_url"] if "source_url" in media else rendered(media, "guid"),
+        )
+
+
+class Loaded(NamedTuple):
+    """Which export datasets were found with some content, checked once"""
+
+    has_info: bool
+    has_categories: bool
+    has_tags: bool
+    has_posts: bool
+    has_pages: bool
+    has_media: bool
+    has_users: bool
 
 
-def posts_per_category(posts, categories):
-    """Group posts by category"""
-    cat_map = {cat["id"]: cat["name"] for cat in categories}
-    result = {}
-    for post in posts:
-        for cat_id in post.get("categories", []):
-            cat_name = cat_map.get(cat_id, f"ID:{cat_id}")
-            result.setdefault(cat_name, []).append(
-                post.get("title", {}).get("rendered", "")
-            )
-    return result
+def tree_categories(categories, parent=0, prefix=""):
+    """Build a hierarchical tree structure of categories"""
+    children_by_parent = defaultdict(list)
+    for cat in categories:
+        children_by_parent[cat.get("parent", 0)].append(cat)
+
+    # Depth-first walk with an explicit stack; children are pushed in reverse
+    # so they are popped in their original order
+    stack = [(cat, prefix) for cat in reversed(children_by_parent[parent])]
+    tree = io.StringIO()
+    w = tree.write
+    while stack:
+        cat, cat_prefix = stack.pop()
+        w(_TREE_LINE(cat_prefix, cat.get("name", "")))
+        child_prefix = cat_prefix + "    "
+        stack.extend(
+            (child, child_prefix)
+            for child in reversed(children_by_parent[cat.get("id", 0)])
+        )
+    return tree.getvalue()
+
+
+def aggregate_posts(post_authors, post_cats, post_titles, cat_map):
+    """
+    Group post titles by category name and count posts per author
+
+    post_authors, post_cats and post_titles are parallel lists holding the
+    author ID, category IDs and rendered title of each post
+    """
+    # Titles are appended in post order, also when categories share a name;
+    # the "ID:" fallback name is only built for IDs missing from cat_map
+    ppc = defaultdict(list)
+    for cat_ids, title in zip(post_cats, post_titles, strict=True):
+        for cat_id in cat_ids:
+            name = cat_map.get(cat_id)
+            if name is None:
+                name = f"ID:{cat_id}"
+            ppc[name].append(title)
+    # Counter tallies the author IDs in C, outside the Python loop
+    user_post_count = Counter(post_authors)
+    return ppc, user_post_count
 
 
 def main():
@@ -65,160 +182,161 @@ def main():
         sys.exit(1)
 
     # Load data files
-    info = load_json(export_dir / "info.json")
+    exports = load_exports(export_dir)
+    info = exports["info"]
     # Handle case where info is a list
     if isinstance(info, list) and len(info) > 0:
         info = info[0]
 
-    categories = load_json(export_dir / "categories.json") or []
-    tags = load_json(export_dir / "tags.json") or []
-
-    # Try both locations for posts/pages (in subdirs or at root)
-    posts = (
-        load_json(export_dir / "posts" / "posts.json")
-        or load_json(export_dir / "posts.json")
-        or []
+    categories = exports["categories"] or []
+    tags = exports["tags"] or []
+    users = exports["users"] or []
+
+    # Keep only the fields the report reads, so the decoded export dicts can
+    # be released before the report is written
+    posts = exports.pop("posts") or []
+    post_authors = [post.get("author") for post in posts]
+    post_cats = [post.get("categories", ()) for post in posts]
+    post_titles = [rendered(post, "title") for post in posts]
+    del posts
+    pages = [rendered(page, "title", "Untitled") for page in exports.pop("pages") or ()]
+    media = [MediaFile.from_json(m) for m in exports.pop("media") or ()]
+
+    loaded = Loaded(
+        has_info=bool(info),
+        has_categories=bool(categories),
+        has_tags=bool(tags),
+        has_posts=bool(post_titles),
+        has_pages=bool(pages),
+        has_media=bool(media),
+        has_users=bool(users),
     )
-    pages = (
-        load_json(export_dir / "pages" / "pages.json")
-        or load_json(export_dir / "pages.json")
-        or []
+
+    # Group posts by category and count posts per author, shared by the
+    # category and user sections
+    cat_map = {cat["id"]: cat["name"] for cat in categories}
+    ppc, user_post_count = aggregate_posts(
+        post_authors, post_cats, post_titles, cat_map
     )
+    sizes = {cat: len(plist) for cat, plist in ppc.items()}
+    cats_by_count = sorted(ppc, key=sizes.__getitem__, reverse=True)
+    cats_by_name = sorted(ppc)
 
-    media = load_json(export_dir / "media.json") or []
-    users = load_json(export_dir / "users.json") or []
-
-    report_lines = []
-    report_lines.append("=" * 50)
-    report_lines.append("WORDPRESS DATA EXTRACTION REPORT")
-    report_lines.append("=" * 50)
-    report_lines.append("")
-
-    # Target info
-    if info:
-        report_lines.append("TARGET INFORMATION")
-        report_lines.append("-" * 50)
-        url = info.get("url", "N/A")
-        name = info.get("name", "N/A")
-        description = info.get("description", "")
-        report_lines.append(f"🌐 URL: {url}")
-        report_lines.append(f"🏷️  Name: {name}")
-        if description:
-            report_lines.append(f"📝 Description: {description}")
-        report_lines.append("")
-
-    # Summary statistics
-    report_lines.append("CONTENT SUMMARY")
-    report_lines.append("-" * 50)
-    report_lines.append(f"📂 Categories: {len(categories)}")
-    report_lines.append(f"🏷️  Tags: {len(tags)}")
-    report_lines.append(f"📝 Posts: {len(posts)}")
-    report_lines.append(f"📄 Pages: {len(pages)}")
-    report_lines.append(f"🖼️  Media: {len(media)}")
-    report_lines.append(f"👤 Users: {len(users)}")
-    report_lines.append("")
-
-    # Posts per category
-    if posts and categories:
-        ppc = posts_per_category(posts, categories)
-        report_lines.append("POSTS PER CATEGORY")
-        report_lines.append("-" * 50)
-        for cat, plist in sorted(ppc.items(), key=lambda x: len(x[1]), reverse=True):
-            report_lines.append(f"  {cat}: {len(plist)} post(s)")
-        report_lines.append("")
-
-    # Category hierarchy
-    if categories:
-        report_lines.append("CATEGORY HIERARCHY")
-        report_lines.append("-" * 50)
-        tree = tree_categories(categories)
-        if tree:
-            report_lines.append(tree)
-        else:
-            report_lines.append("  (No categories or flat structure)")
-        report_lines.append("")
-
-    # Tags
-    if tags:
-        report_lines.append("TAGS")
-        report_lines.append("-" * 50)
-        tag_names = [f"🏷️  {tag.get('name', '')}" for tag in tags]
-        # Wrap tags nicely
-        report_lines.append("  " + ", ".join(tag_names))
-        report_lines.append("")
-
-    # Posts by category
-    if posts and categories:
-        report_lines.append("POSTS BY CATEGORY")
-        report_lines.append("-" * 50)
-        ppc = posts_per_category(posts, categories)
-        for cat, plist in sorted(ppc.items()):
-            report_lines.append(f"  📂 {cat}:")
-            report_lines.extend(f"    - 📝 {post_title}" for post_title in plist)
-        report_lines.append("")
-
-    # Pages
-    if pages:
-        report_lines.append("PAGES")
-        report_lines.append("-" * 50)
-        for page in pages:
-            title = page.get("title", {}).get("rendered", page.get("title", "Untitled"))
-            report_lines.append(f"  📄 {title}")
-        report_lines.append("")
-
-    # Media
-    if media:
-        report_lines.append("MEDIA FILES")
-        report_lines.append("-" * 50)
-        for m in media:
-            url = m.get("source_url", m.get("guid", {}).get("rendered", ""))
-            name = m.get("title", {}).get("rendered", m.get("title", "Unnamed"))
-            mime_type = m.get("mime_type", "")
-            report_lines.append(f"  🖼️  {name}")
-            if mime_type:
-                report_lines.append(f"     Type: {mime_type}")
-            report_lines.append(f"     URL: {url}")
-        report_lines.append("")
-
-    # Users with post counts
-    if users:
-        report_lines.append("USERS")
-        report_lines.append("-" * 50)
-
-        # Calculate post counts per user
-        user_post_count = {}
-        for post in posts:
-            author_id = post.get("author")
-            user_post_count[author_id] = user_post_count.get(author_id, 0) + 1
-
-        # Create user list with counts
-        users_with_count = []
-        for user in users:
-            user_id = user.get("id")
-            name = user.get("name", user.get("username", "Unknown"))
-            post_count = user_post_count.get(user_id, 0)
-            users_with_count.append((name, post_count))
-
-        # Sort by post count (descending)
-        users_with_count.sort(key=lambda x: x[1], reverse=True)
-
-        for name, post_count in users_with_count:
-            report_lines.append(f"  👤 {name} [{post_count} post(s)]")
-        report_lines.append("")
-
-    # Footer
-    report_lines.append("=" * 50)
-    report_lines.append("End of Report")
-    report_lines.append("=" * 50)
-
-    # Write report
+    # Write report sections straight to disk as they are generated
     report_path = export_dir / "report.txt"
-    with report_path.open("w", encoding="utf-8") as f:
-        f.write("\n".join(report_lines))
+    with report_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        w = f.write
+        w("=" * 50 + "\n")
+        w("WORDPRESS DATA EXTRACTION REPORT\n")
+        w("=" * 50 + "\n")
+        w("\n")
+
+        # Target info
+        if loaded.has_info:
+            w("TARGET INFORMATION\n")
+            w("-" * 50 + "\n")
+            url = info.get("url", "N/A")
+            name = info.get("name", "N/A")
+            description = info.get("description", "")
+            w(f"🌐 URL: {url}\n")
+            w(f"🏷️  Name: {name}\n")
+            if description:
+                w(f"📝 Description: {description}\n")
+            w("\n")
+
+        # Summary statistics
+        w("CONTENT SUMMARY\n")
+        w("-" * 50 + "\n")
+        w(f"📂 Categories: {len(categories)}\n")
+        w(f"🏷️  Tags: {len(tags)}\n")
+        w(f"📝 Posts: {len(post_titles)}\n")
+        w(f"📄 Pages: {len(pages)}\n")
+        w(f"🖼️  Media: {len(media)}\n")
+        w(f"👤 Users: {len(users)}\n")
+        w("\n")
+
+        # Posts per category
+        if loaded.has_posts and loaded.has_categories:
+            w("POSTS PER CATEGORY\n")
+            w("-" * 50 + "\n")
+            f.writelines(_CATEGORY_COUNT_LINE(cat, sizes[cat]) for cat in cats_by_count)
+            w("\n")
+
+        # Category hierarchy
+        if loaded.has_categories:
+            w("CATEGORY HIERARCHY\n")
+            w("-" * 50 + "\n")
+            tree = tree_categories(categories)
+            if tree:
+                w(tree)
+                w("\n")
+            else:
+                w("  (No categories or flat structure)\n")
+            w("\n")
+
+        # Tags
+        if loaded.has_tags:
+            w("TAGS\n")
+            w("-" * 50 + "\n")
+            tag_names = [f"🏷️  {tag.get('name', '')}" for tag in tags]
+            # Wrap tags nicely
+            w("  " + ", ".join(tag_names) + "\n")
+            w("\n")
+
+        # Posts by category
+        if loaded.has_posts and loaded.has_categories:
+            w("POSTS BY CATEGORY\n")
+            w("-" * 50 + "\n")
+            for cat in cats_by_name:
+                w(_CATEGORY_HEADING(cat))
+                f.writelines(map(_POST_LINE, ppc[cat]))
+            w("\n")
+
+        # Pages
+        if loaded.has_pages:
+            w("PAGES\n")
+            w("-" * 50 + "\n")
+            f.writelines(map(_PAGE_LINE, pages))
+            w("\n")
+
+        # Media
+        if loaded.has_media:
+            w("MEDIA FILES\n")
+            w("-" * 50 + "\n")
+            for m in media:
+                if m.mime_type:
+                    w(_MEDIA_LINES_WITH_TYPE(m.name, m.mime_type, m.url))
+                else:
+                    w(_MEDIA_LINES(m.name, m.url))
+            w("\n")
+
+        # Users with post counts
+        if loaded.has_users:
+            w("USERS\n")
+            w("-" * 50 + "\n")
+
+            # Create user list with counts
+            users_with_count = []
+            for user in users:
+                user_id = user.get("id")
+                name = user.get("name", user.get("username", "Unknown"))
+                post_count = user_post_count.get(user_id, 0)
+                users_with_count.append((name, post_count))
+
+            # Sort by post count (descending)
+            users_with_count.sort(key=lambda x: x[1], reverse=True)
+
+            f.writelines(starmap(_USER_LINE, users_with_count))
+            w("\n")
+
+        # Footer
+        w("=" * 50 + "\n")
+        w("End of Report\n")
+        w("=" * 50 + "\n")
 
     print(f"✅ Report generated successfully: {report_path}")
     print("\n📊 Summary:")
-    print(f"   - {len(posts)} posts")
+    print(f"   - {len(post_titles)} posts")
     print(f"   - {len(pages)} pages")
     print(f"   - {len(categories)} categories")
     print(f"   - {len(tags)} tags")
@@ -32,6 +32,9 @@ import requests
 from lib.console import Console
 from lib.utils import get_by_id, print_progress_bar
 
+# Format of the GMT dates of posts and comments, with "-GMT" appended
+_DATE_FMT = "%Y-%m-%dT%H:%M:%S-%Z"
+
 
 class Exporter:
     """
@@ -525,8 +528,6 @@ class Exporter:
         """
         exported_posts = 0
 
-        date_format = "%Y-%m-%dT%H:%M:%S-%Z"
-
         folder_path = Path(folder)
         if not folder_path.is_dir():
             folder_path.mkdir(parents=True)
@@ -548,11 +549,11 @@ class Exporter:
 
             date_gmt = "Unknown"
             if "date_gmt" in post:
-                date_gmt = datetime.strptime(post["date_gmt"] + "-GMT", date_format)
+                date_gmt = datetime.strptime(post["date_gmt"] + "-GMT", _DATE_FMT)
             modified_gmt = "Unknown"
             if "modified_gmt" in post:
                 modified_gmt = datetime.strptime(
-                    post["modified_gmt"] + "-GMT", date_format
+                    post["modified_gmt"] + "-GMT", _DATE_FMT
                 )
             status = "Unknown"
             if "status" in post:
@@ -722,7 +723,6 @@ class Exporter:
 
     @staticmethod
     def export_comments_helper(comment, post, export_folder):
-        date_format = "%Y-%m-%dT%H:%M:%S-%Z"
         export_path = Path(export_folder)
         if not export_path.is_dir():
             export_path.mkdir()
@@ -735,7 +735,7 @@ class Exporter:
         )
         date_gmt = "Unknown"
         if "date_gmt" in comment:
-            date_gmt = datetime.strptime(comment["date_gmt"] + "-GMT", date_format)
+            date_gmt = datetime.strptime(comment["date_gmt"] + "-GMT", _DATE_FMT)
         post_link = "None"
         if (
             "_links" in comment
@@ -22,12 +22,44 @@ SOFTWARE.
 
 import csv
 import html
+import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 from lib.console import Console
 
 
+@lru_cache(maxsize=1)
+def _load_ns_ref():
+    """
+    Loads the namespace reference file once and keeps it for later calls
+    """
+    ns_ref = {}
+    try:
+        with Path("lib/plugins/plugin_list.csv").open(newline="") as ns_ref_file:
+            for row in csv.reader(ns_ref_file):
+                desc = None
+                url = None
+                if len(row) > 1 and len(row[1]) > 0:
+                    desc = row[1]
+                if len(row) > 2 and len(row[2]) > 0:
+                    url = row[2]
+                ns_ref[row[0]] = {"desc": desc, "url": url}
+    except OSError as e:
+        Console.log_error(f"Could not load namespaces reference file: {e}")
+    return ns_ref
+
+
+@lru_cache(maxsize=8192)
+def _unescape_title(title):
+    """
+    html.unescape for short strings that often repeat across listings, such as
+    titles; long excerpts and contents are not cached
+    """
+    return html.unescape(title)
+
+
 class InfoDisplayer:
     """
     Static class to display information for different categories
@@ -63,20 +95,7 @@ class InfoDisplayer:
 
         if "namespaces" in information:
             print("Namespaces (API provided by addons):")
-            ns_ref = {}
-            try:
-                with Path("lib/plugins/plugin_list.csv").open() as ns_ref_file:
-                    ns_ref_reader = csv.reader(ns_ref_file)
-                    for row in ns_ref_reader:
-                        desc = None
-                        url = None
-                        if len(row) > 1 and len(row[1]) > 0:
-                            desc = row[1]
-                        if len(row) > 2 and len(row[2]) > 0:
-                            url = row[2]
-                        ns_ref[row[0]] = {"desc": desc, "url": url}
-            except:
-                Console.log_error("Could not load namespaces reference file")
+            ns_ref = _load_ns_ref()
             for ns in information["namespaces"]:
                 tip = ""
                 if ns in ns_ref:
@@ -120,40 +139,30 @@ class InfoDisplayer:
             return
 
         for url, route in information["routes"].items():
-            print("{} (Namespace: {})".format(url, route["namespace"]))
+            lines = ["{} (Namespace: {})".format(url, route["namespace"])]
             for endpoint in route["endpoints"]:
-                methods = "    "
-                first = True
-                for method in endpoint["methods"]:
-                    if first:
-                        methods += method
-                        first = False
-                    else:
-                        methods += ", " + method
-                print(methods)
+                lines.append("    " + ", ".join(endpoint["methods"]))
                 if len(endpoint["args"]) > 0:
                     for arg, props in endpoint["args"].items():
                         required = ""
                         if props["required"]:
                             required = " (required)"
-                        print("        " + arg + required)
+                        lines.append("        " + arg + required)
                         if "type" in props:
-                            print("            type: " + str(props["type"]))
+                            lines.append("            type: " + str(props["type"]))
                         if "default" in props:
-                            print("            default: " + str(props["default"]))
+                            lines.append(
+                                "            default: " + str(props["default"])
+                            )
                         if "enum" in props:
-                            allowed = "            allowed values: "
-                            first = True
-                            for val in props["enum"]:
-                                if first:
-                                    allowed += str(val)
-                                    first = False
-                                else:
-                                    allowed += ", " + str(val)
-                            print(allowed)
+                            lines.append(
+                                "            allowed values: "
+                                + ", ".join(map(str, props["enum"]))
+                            )
                         if "description" in props:
-                            print("            " + str(props["description"]))
-            print()
+                            lines.append("            " + str(props["description"]))
+            lines.append("")
+            print("\n".join(lines))
 
     @staticmethod
     def display_posts(information, orphan_comments=None, details=False):
@@ -163,70 +172,77 @@ class InfoDisplayer:
         """
         if orphan_comments is None:
             orphan_comments = []
-        print()
-        date_format = "%Y-%m-%dT%H:%M:%S-%Z"
+        out = ["\n"]
         for post in information:
             if post is not None:
-                line = ""
                 if "id" in post:
-                    line += f"ID: {post['id']}"
+                    out.append(f"ID: {post['id']}")
                 if "title" in post:
-                    line += " - " + html.unescape(post["title"]["rendered"])
+                    out.append(" - " + _unescape_title(post["title"]["rendered"]))
                 if "date_gmt" in post:
-                    date_gmt = datetime.strptime(post["date_gmt"] + "-GMT", date_format)
-                    line += " on {}".format(date_gmt.strftime("%d/%m/%Y at %H:%M:%S"))
+                    date_gmt = datetime.fromisoformat(post["date_gmt"])
+                    out.append(
+                        " on {}".format(date_gmt.strftime("%d/%m/%Y at %H:%M:%S"))
+                    )
                 if "link" in post:
-                    line += " - " + post["link"]
+                    out.append(" - " + post["link"])
                 if details:
                     if "slug" in post:
-                        line += "\nSlug: " + post["slug"]
+                        out.append("\nSlug: " + post["slug"])
                     if "status" in post:
-                        line += "\nStatus: " + post["status"]
+                        out.append("\nStatus: " + post["status"])
                     if "author" in post:
-                        line += f"\nAuthor ID: {post['author']}"
+                        out.append(f"\nAuthor ID: {post['author']}")
                     if "comment_status" in post:
-                        line += "\nComment status: " + post["comment_status"]
+                        out.append("\nComment status: " + post["comment_status"])
                     if "template" in post and len(post["template"]) > 0:
-                        line += "\nTemplate: " + post["template"]
+                        out.append("\nTemplate: " + post["template"])
                     if "categories" in post and len(post["categories"]) > 0:
-                        line += "\nCategory IDs: "
-                        for cat in post["categories"]:
-                            line += f"{cat}, "
-                        line = line[:-2]
+                        out.append(
+                            "\nCategory IDs: " + ", ".join(map(str, post["categories"]))
+                        )
                     if "excerpt" in post:
-                        line += "\nExcerpt: "
+                        out.append("\nExcerpt: ")
                         if (
                             "protected" in post["excerpt"]
                             and post["excerpt"]["protected"]
                         ):
-                            line += "<post is protected>"
+                            out.append("<post is protected>")
                         elif "rendered" in post["excerpt"]:
-                            line += "\n" + html.unescape(post["excerpt"]["rendered"])
+                            out.append(
+                                "\n" + html.unescape(post["excerpt"]["rendered"])
+                            )
                     if "content" in post:
-                        line += "\nContent: "
+                        out.append("\nContent: ")
                         if (
                             "protected" in post["content"]
                             and post["content"]["protected"]
                         ):
-                            line += "<post is protected>"
+                            out.append("<post is protected>")
                         elif "rendered" in post["content"]:
-                            line += "\n" + html.unescape(post["content"]["rendered"])
+                            out.append(
+                                "\n" + html.unescape(post["content"]["rendered"])
+                            )
                 if "comments" in post:
-                    for comment in post["comments"]:
-                        line += "\n\t * Comment by {} from ({}) - {}".format(
+                    out.extend(
+                        "\n\t * Comment by {} from ({}) - {}".format(
                             comment["author_name"],
                             comment["author_url"],
                             comment["link"],
                         )
-                print(line)
+                        for comment in post["comments"]
+                    )
+                out.append("\n")
 
         if len(orphan_comments) > 0:
             # TODO: Untested code, may never be executed, I don't know how the REST API and WordPress handle post/comment link in back-end
-            print()
-            print("Found orphan comments! Check them right below:")
-            for comment in post["comments"]:
-                line += f"\n\t * Comment by {comment['author_name']} from ({comment['author_url']}) on post ID {comment['post']} - {comment['link']}"
-        print()
+            out.append("\nFound orphan comments! Check them right below:\n")
+            out.extend(
+                f"\t * Comment by {comment['author_name']} from ({comment['author_url']}) on post ID {comment['post']} - {comment['link']}\n"
+                for comment in orphan_comments
+            )
+        out.append("\n")
+        sys.stdout.write("".join(out))
 
     @staticmethod
     def display_comments(information, details=False):
@@ -236,37 +252,39 @@ class InfoDisplayer:
         :param information: information as a JSON object
         :param details: if the details should be displayed
         """
-        print()
-        date_format = "%Y-%m-%dT%H:%M:%S-%Z"
+        out = ["\n"]
         for comment in information:
             if comment is not None:
-                line = ""
                 if "id" in comment:
-                    line += f"ID: {comment['id']}"
+                    out.append(f"ID: {comment['id']}")
                 if "post" in comment:
-                    line += f" - Post ID: {comment['post']}"  # html.unescape(post['title']['rendered'])
+                    out.append(
+                        f" - Post ID: {comment['post']}"
+                    )  # html.unescape(post['title']['rendered'])
                 if "author_name" in comment:
-                    line += " - By {}".format(comment["author_name"])
+                    out.append(" - By {}".format(comment["author_name"]))
                 if "date" in comment:
-                    date_gmt = datetime.strptime(
-                        comment["date_gmt"] + "-GMT", date_format
+                    date_gmt = datetime.fromisoformat(comment["date_gmt"])
+                    out.append(
+                        " on {}".format(date_gmt.strftime("%d/%m/%Y at %H:%M:%S"))
                     )
-                    line += " on {}".format(date_gmt.strftime("%d/%m/%Y at %H:%M:%S"))
                 if details:
                     if "parent" in comment and comment["parent"] != 0:
-                        line += "\nParent ID: " + comment["parent"]
+                        out.append("\nParent ID: " + comment["parent"])
                     if "link" in comment:
-                        line += "\nLink: " + comment["link"]
+                        out.append("\nLink: " + comment["link"])
                     if "status" in comment:
-                        line += "\nStatus: " + comment["status"]
+                        out.append("\nStatus: " + comment["status"])
                     if "author_url" in comment and len(comment["author_url"]) > 0:
-                        line += "\nAuthor URL: " + comment["author_url"]
+                        out.append("\nAuthor URL: " + comment["author_url"])
                     if "content" in comment:
-                        line += "\nContent: \n" + html.unescape(
-                            comment["content"]["rendered"]
+                        out.append(
+                            "\nContent: \n"
+                            + html.unescape(comment["content"]["rendered"])
                         )
-                print(line)
-        print()
+                out.append("\n")
+        out.append("\n")
+        sys.stdout.write("".join(out))
 
     @staticmethod
     def display_users(information, details=False):
@@ -377,61 +395,62 @@ class InfoDisplayer:
         :param information: information as a JSON object
         :param details: if the details should be displayed
         """
-        print()
-        date_format = "%Y-%m-%dT%H:%M:%S-%Z"
+        out = ["\n"]
         for media in information:
             if media is not None:
-                line = ""
                 if "id" in media:
-                    line += f"Media ID: {media['id']}\n"
+                    out.append(f"Media ID: {media['id']}\n")
                 if "title" in media and "rendered" in media["title"]:
-                    line += "    Media title: {}\n".format(
-                        html.unescape(media["title"]["rendered"])
+                    out.append(
+                        "    Media title: {}\n".format(
+                            _unescape_title(media["title"]["rendered"])
+                        )
                     )
                 if "date_gmt" in media:
-                    date_gmt = datetime.strptime(
-                        media["date_gmt"] + "-GMT", date_format
-                    )
-                    line += "    Upload date (GMT): {}\n".format(
-                        date_gmt.strftime("%d/%m/%Y %H:%M:%S")
+                    date_gmt = datetime.fromisoformat(media["date_gmt"])
+                    out.append(
+                        "    Upload date (GMT): {}\n".format(
+                            date_gmt.strftime("%d/%m/%Y %H:%M:%S")
+                        )
                     )
                 if "media_type" in media:
-                    line += "    Media type: {}\n".format(media["media_type"])
+                    out.append("    Media type: {}\n".format(media["media_type"]))
                 if "mime_type" in media:
-                    line += "    Mime type: {}\n".format(media["mime_type"])
+                    out.append("    Mime type: {}\n".format(media["mime_type"]))
                 if "link" in media:
-                    line += "    Page: {}\n".format(media["link"])
+                    out.append("    Page: {}\n".format(media["link"]))
                 if "source_url" in media:
-                    line += "    Source URL: {}\n".format(media["source_url"])
+                    out.append("    Source URL: {}\n".format(media["source_url"]))
                 if details:
                     if "slug" in media:
-                        line += "Slug: " + media["slug"] + "\n"
+                        out.append("Slug: " + media["slug"] + "\n")
                     if "status" in media:
-                        line += "Status: " + media["status"] + "\n"
+                        out.append("Status: " + media["status"] + "\n")
                     if "type" in media:
-                        line += "Type: " + media["type"] + "\n"
+                        out.append("Type: " + media["type"] + "\n")
                     if "author" in media:
-                        line += f"Author ID: {media['author']}\n"
+                        out.append(f"Author ID: {media['author']}\n")
                     if "alt_text" in media:
-                        line += "Alt text: " + media["alt_text"] + "\n"
+                        out.append("Alt text: " + media["alt_text"] + "\n")
                     if "comment_status" in media:
-                        line += "Comment status: " + media["comment_status"] + "\n"
+                        out.append("Comment status: " + media["comment_status"] + "\n")
                     if "post" in media:
-                        line += f"Post or page ID: {media['post']}\n"
+                        out.append(f"Post or page ID: {media['post']}\n")
                     if "description" in media and media["description"]["rendered"]:
-                        line += (
+                        out.append(
                             "Description: \n"
                             + html.unescape(media["description"]["rendered"])
                             + "\n"
                         )
                     if "caption" in media and media["caption"]["rendered"]:
-                        line += (
+                        out.append(
                             "Caption: \n"
                             + html.unescape(media["caption"]["rendered"])
                             + "\n"
                         )
-                print(line)
-        print()
+                out.append("\n")
+        out.append("\n")
+        sys.stdout.write("".join(out))
 
     @staticmethod
     def display_pages(information, details=False):
@@ -441,95 +460,122 @@ class InfoDisplayer:
         :param information: information as a JSON object
         :param details: if the details should be displayed
         """
-        print()
+        out = ["\n"]
         for page in information:
             if page is not None:
-                line = ""
                 if "id" in page:
-                    line += f"ID: {page['id']}"
+                    out.append(f"ID: {page['id']}")
                 if "title" in page and "rendered" in page["title"]:
-                    line += " - " + html.unescape(page["title"]["rendered"])
+                    out.append(" - " + _unescape_title(page["title"]["rendered"]))
                 if "link" in page:
-                    line += " - " + page["link"]
+                    out.append(" - " + page["link"])
                 if details:
                     if "slug" in page:
-                        line += "\nSlug: " + page["slug"]
+                        out.append("\nSlug: " + page["slug"])
                     if "status" in page:
-                        line += "\nStatus: " + page["status"]
+                        out.append("\nStatus: " + page["status"])
                     if "author" in page:
-                        line += f"\nAuthor ID: {page['author']}"
+                        out.append(f"\nAuthor ID: {page['author']}")
                     if "comment_status" in page:
-                        line += "\nComment status: " + page["comment_status"]
+                        out.append("\nComment status: " + page["comment_status"])
                     if "template" in page and len(page["template"]) > 0:
-                        line += "\nTemplate: " + page["template"]
+                        out.append("\nTemplate: " + page["template"])
                     if "parent" in page:
                         if page["parent"] == 0:
-                            line += "\nParent: none"
+                            out.append("\nParent: none")
                         else:
-                            line += f"\nParent ID: {page['parent']}"
+                            out.append(f"\nParent ID: {page['parent']}")
                     if "excerpt" in page:
-                        line += "\nExcerpt: "
+                        out.append("\nExcerpt: ")
                         if (
                             "protected" in page["excerpt"]
                             and page["excerpt"]["protected"]
                         ):
-                            line += "<page is protected>"
+                            out.append("<page is protected>")
                         elif "rendered" in page["excerpt"]:
-                            line += "\n" + html.unescape(page["excerpt"]["rendered"])
+                            out.append(
+                                "\n" + html.unescape(page["excerpt"]["rendered"])
+                            )
                     if "content" in page:
-                        line += "\nContent: "
+                        out.append("\nContent: ")
                         if (
                             "protected" in page["content"]
                             and page["content"]["protected"]
                         ):
-                            line += "<page is protected>"
+                            out.append("<page is protected>")
                         elif "rendered" in page["content"]:
-                            line += "\n" + html.unescape(page["content"]["rendered"])
-                print(line)
-        print()
+                            out.append(
+                                "\n" + html.unescape(page["content"]["rendered"])
+                            )
+                out.append("\n")
+        out.append("\n")
+        sys.stdout.write("".join(out))
 
     @staticmethod
     def recurse_list_or_dict(data, tab):
         """
         Helper function to generate recursive display of API data
+
+        Nested lists and dicts are walked with an explicit stack instead of
+        recursive calls
         """
-        if type(data) is not dict and type(data) is not list:
+        # Type objects bound as locals, each value's type is looked up once
+        dict_type = dict
+        list_type = list
+        str_type = str
+
+        data_type = type(data)
+        if data_type is not dict_type and data_type is not list_type:
             return tab + str(data)
 
-        line = ""
-        if type(data) is list:
-            length = len(data)
-            for i, value in enumerate(data):
-                do_jmp = True
-                if type(value) is dict or type(value) is list:
-                    line += InfoDisplayer.recurse_list_or_dict(value, tab + "\t")
-                elif type(value) is str:
-                    if "\n" in value:
-                        line += "\n" + tab + "\t"
-                        line += value.replace("\n", "\n" + tab + "\t")
+        parts = []
+        # Holds text still to emit and (container, tab) pairs still to expand,
+        # the next one to output being on top
+        stack = [(data, tab)]
+        while stack:
+            item = stack.pop()
+            if type(item) is str_type:
+                parts.append(item)
+                continue
+
+            node, node_tab = item
+            child_tab = node_tab + "\t"
+            fragments = []
+            if type(node) is list_type:
+                last = len(node) - 1
+                for i, value in enumerate(node):
+                    value_type = type(value)
+                    if value_type is str_type:
+                        if "\n" not in value:
+                            # Short strings stay on the line of the next item
+                            fragments.append(" " + value)
+                            continue
+                        fragments.append(
+                            "\n" + child_tab + value.replace("\n", "\n" + child_tab)
+                        )
+                    elif value_type is dict_type or value_type is list_type:
+                        fragments.append((value, child_tab))
                     else:
-                        line += " "
-                        line += value.replace("\n", "\n" + tab)
-                        do_jmp = False
-                else:
-                    line += " " + str(value)
-                if i < length - 1 and do_jmp:
-                    line += "\n"
-        else:
-            for key, value in data.items():
-                line += "\n" + tab + key
-                if type(value) is dict or type(value) is list:
-                    line += InfoDisplayer.recurse_list_or_dict(value, tab + "\t")
-                elif type(value) is str:
-                    if "\n" in value:
-                        line += "\n" + tab + "\t"
-                        line += value.replace("\n", "\n" + tab + "\t")
+                        fragments.append(" " + str(value))
+                    if i < last:
+                        fragments.append("\n")
+            else:
+                for key, value in node.items():
+                    fragments.append("\n" + node_tab + key)
+                    value_type = type(value)
+                    if value_type is str_type:
+                        if "\n" in value:
+                            fragments.append(
+                                "\n" + child_tab + value.replace("\n", "\n" + child_tab)
+                            )
+                        else:
+                            fragments.append(" " + value)
+                    elif value_type is dict_type or value_type is list_type:
+                        fragments.append((value, child_tab))
                     else:
-                        line += " "
-                        line += value.replace("\n", "\n" + tab)
-                else:
-                    line += " " + str(value)
-        return line
+                        fragments.append(" " + str(value))
+            stack.extend(reversed(fragments))
+        return "".join(parts)
 
     @staticmethod
     def display_crawled_ns(information):
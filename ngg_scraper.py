@@ -1,24 +1,95 @@
 import argparse
 import json
-import re
+import os
+import shutil
+import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice, repeat
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlunparse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import lxml  # noqa: F401
 
-def scrape_ngg_images(posts_file, output_folder, delay=0.5):
-    with Path(posts_file).open() as f:
-        posts = json.load(f)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
-    output_path = Path(output_folder)
-    if not output_path.exists():
-        output_path.mkdir(parents=True)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# Network-bound workers, so several per CPU
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
+IMAGE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "gif", "webp"})
+NGG_GALLERY_PATH = b"/wp-content/gallery/"
+NGG_CLASS_PREFIX = b"ngg-"
+# Smaller bodies are error stubs or redirects rather than rendered posts
+MIN_PAGE_BYTES = 512
+# Image downloads from one host run at most this many at a time
+IMAGE_DOWNLOADS_PER_HOST = 4
+
+
+class HostRateLimiter:
+    """
+    Spaces out post page requests to the same host by at least `delay`
+    seconds, whichever worker sends them. Image downloads are not paced here;
+    HostSemaphores bounds them instead, as the sequential scan fetched a post's
+    images back to back after its page
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Wakes up every waiting worker at once"""
+        self._stopped.set()
+
+    def wait(self, url):
+        if self.delay <= 0 or self._stopped.is_set():
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+        if slot > now:
+            self._stopped.wait(slot - now)
+
+
+class HostSemaphores:
+    """
+    Bounds the number of concurrent requests to the same host to `limit`
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def for_url(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.limit)
+                self._semaphores[host] = semaphore
+        return semaphore
 
-    print(f"Found {len(posts)} posts. Scanning for NextGEN Gallery images...")
 
+def make_session(pool_size):
     session = requests.Session()
     # mimic browser to avoid blocking
     session.headers.update(
@@ -26,105 +97,313 @@ def scrape_ngg_images(posts_file, output_folder, delay=0.5):
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
         }
     )
+    # One pooled connection per worker so keep-alive survives concurrency.
+    # Transient gateway errors are retried with backoff, and the last response
+    # is returned rather than raised once retries run out
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def scrape_ngg_images(
+    posts_file, output_folder, delay=0.5, jobs=DEFAULT_JOBS, *, max_bytes=None, cap=0
+):
+    output_path = Path(output_folder)
+    if not output_path.exists():
+        output_path.mkdir(parents=True)
+
+    # Post workers and image download workers each hold a connection
+    session = make_session(2 * jobs)
+    limiter = HostRateLimiter(delay)
+
+    with Path(posts_file).open("rb") as f:
+        if ijson is not None:
+            # Stream posts one at a time instead of decoding the whole file
+            posts = ijson.items(f, "item")
+            total = None
+            print("Streaming posts. Scanning for NextGEN Gallery images...")
+        else:
+            posts = json.load(f)
+            total = len(posts)
+            print(f"Found {total} posts. Scanning for NextGEN Gallery images...")
+
+        # Images get their own pool: post workers block on their downloads, so
+        # sharing one pool could leave no worker free to run them
+        with (
+            ThreadPoolExecutor(max_workers=jobs) as pool,
+            ThreadPoolExecutor(max_workers=jobs) as download_pool,
+        ):
+            run = ScrapeRun(
+                session,
+                limiter,
+                HostSemaphores(IMAGE_DOWNLOADS_PER_HOST),
+                download_pool,
+                output_path,
+                total=total,
+                max_bytes=max_bytes,
+                cap=cap,
+            )
+            # Keep a bounded number of posts in flight so a streamed posts
+            # file is never read far ahead of the workers
+            total_downloaded = 0
+            in_flight = set()
+            try:
+                for index, post in enumerate(posts, 1):
+                    if len(in_flight) >= 2 * jobs:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        total_downloaded += sum(future.result() for future in done)
+                    in_flight.add(pool.submit(run.process_post, index, post))
+                total_downloaded += sum(future.result() for future in in_flight)
+            except KeyboardInterrupt:
+                # Drop queued posts and images so that Ctrl-C only waits for
+                # the requests already in progress
+                run.stop()
+                pool.shutdown(wait=False, cancel_futures=True)
+                download_pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    print(f"Done. Downloaded {total_downloaded} new images.")
+
+
+class ScrapeRun:
+    """
+    State shared by the post and image workers of one scrape_ngg_images call
+    """
 
-    total_downloaded = 0
+    def __init__(
+        self,
+        session,
+        limiter,
+        image_slots,
+        download_pool,
+        output_path,
+        *,
+        total,
+        max_bytes,
+        cap,
+    ):
+        self.session = session
+        self.limiter = limiter
+        self.image_slots = image_slots
+        self.download_pool = download_pool
+        self.output_path = output_path
+        self.total = total
+        self.max_bytes = max_bytes
+        self.cap = cap
+        # Target files already being downloaded, across all posts of the run
+        self._claimed = set()
+        self._claim_lock = threading.Lock()
+        self._stopped = threading.Event()
 
-    for i, post in enumerate(posts):
+    def stop(self):
+        """Makes running workers return without starting further requests"""
+        self._stopped.set()
+        self.limiter.stop()
+
+    def process_post(self, index, post):
+        """Scans one post for NGG images and downloads them, returns the count"""
         link = post.get("link")
         title = post.get("title", {}).get("rendered", "untitled")
         slug = post.get("slug", str(post.get("id")))
 
-        if not link:
-            continue
+        if not link or self._stopped.is_set():
+            return 0
 
-        print(f"[{i + 1}/{len(posts)}] Scanning: {title}")
+        progress = f"{index}/{self.total}" if self.total is not None else str(index)
+        # Messages of one post are printed together, so that output from
+        # concurrent workers does not interleave
+        log = [f"[{progress}] Scanning: {title}"]
+        try:
+            return self._scan_post(link, slug, log)
+        finally:
+            sys.stdout.write("\n".join(log) + "\n")
 
+    def _scan_post(self, link, slug, log):
         try:
-            r = session.get(link, timeout=10)
+            self.limiter.wait(link)
+            if self._stopped.is_set():
+                return 0
+            r = self.session.get(link, timeout=10)
             if r.status_code != 200:
-                print(f"  Failed to fetch {link} (Status {r.status_code})")
-                continue
+                log.append(f"  Failed to fetch {link} (Status {r.status_code})")
+                return 0
 
-            soup = BeautifulSoup(r.content, "html.parser")
+            # Near-empty pages and pages without any NextGEN markup are skipped
+            # before parsing
+            body = r.content
+            if len(body) < MIN_PAGE_BYTES or (
+                NGG_GALLERY_PATH not in body and NGG_CLASS_PREFIX not in body
+            ):
+                return 0
+
+            soup = BeautifulSoup(body, HTML_PARSER)
 
             # Find images. Strategies:
             # 1. Look for 'ngg-' class
             # 2. Look for images in /wp-content/gallery/ path
 
-            images_to_download = set()
+            # Canonical image URL -> file name it is saved under
+            images_to_download = {}
+
+            # Both strategies are checked in a single pass over links and images
+            for tag in soup.find_all(("a", "img")):
+                attrs = tag.attrs
+                href = attrs.get("href")
+                url = href or attrs.get("src")
 
-            # Strategy 1: Common NGG containers
-            # <div class="ngg-gallery-thumbnail"> <a href="..."> <img ...> </a> </div>
-            for thumb in soup.select(".ngg-gallery-thumbnail a, .ngg-fancybox"):
-                href = thumb.get("href")
-                if href and is_image_url(href):
-                    images_to_download.add(href)
+                # Strategy 1: Common NGG containers
+                # <div class="ngg-gallery-thumbnail"> <a href="..."> <img ...> </a> </div>
+                if href and is_image_url(href) and is_ngg_thumbnail_link(tag):
+                    img_url, filename = canonical_url(href, link)
+                    images_to_download[img_url] = filename
 
-            # Strategy 2: URL pattern matching in all links/images
-            for tag in soup.find_all(["a", "img"]):
-                url = tag.get("href") or tag.get("src")
+                # Strategy 2: URL pattern matching in all links/images
                 if url and "/wp-content/gallery/" in url:
-                    # Clean up URL (remove query params for storage, but maybe keep for fetch? usually static)
-                    # Often thumbnails have /thumbs/ in path, we want the full size.
-                    # e.g. /wp-content/gallery/album-name/thumbs/thumbs_DSC.jpg
-                    # full: /wp-content/gallery/album-name/DSC.jpg
-
-                    if "/thumbs/" in url:
-                        # Try to guess full size URL
-                        full_url = url.replace("/thumbs/thumbs_", "/").replace(
-                            "/thumbs/", "/"
-                        )
-                        images_to_download.add(full_url)
-                    else:
-                        images_to_download.add(url)
+                    img_url, filename = canonical_url(strip_thumbs(url), link)
+                    images_to_download[img_url] = filename
+
+            if self.cap > 0:
+                images_to_download = dict(islice(images_to_download.items(), self.cap))
 
             if not images_to_download:
                 # Fallback: check raw content for shortcode if we missed anything?
                 # No, we are scraping rendered HTML.
                 pass
 
-            if images_to_download:
-                print(f"  Found {len(images_to_download)} potential NGG images.")
-                post_media_dir = output_path / slug
-                if not post_media_dir.exists():
-                    post_media_dir.mkdir(parents=True)
-
-                for img_url in images_to_download:
-                    # Normalize the URL
-                    normalized_url = img_url
-                    if normalized_url.startswith("//"):
-                        normalized_url = "https:" + normalized_url
-                    elif normalized_url.startswith("/"):
-                        normalized_url = urljoin(link, normalized_url)
-
-                    filename = Path(urlparse(normalized_url).path).name
-                    filepath = post_media_dir / filename
+            if images_to_download and not self._stopped.is_set():
+                log.append(f"  Found {len(images_to_download)} potential NGG images.")
+                post_media_dir = self.output_path / slug
+                # exist_ok: posts sharing a slug may be processed concurrently
+                post_media_dir.mkdir(parents=True, exist_ok=True)
+                # One directory listing instead of a stat() per candidate image
+                existing = {entry.name for entry in post_media_dir.iterdir()}
 
-                    if filepath.exists():
-                        # print(f"    Skipping existing: {filename}")
+                # Candidate URLs keyed by target file
+                downloads = {}
+                for img_url, filename in images_to_download.items():
+                    if not filename or filename in existing:
+                        # log.append(f"    Skipping existing: {filename}")
                         continue
+                    filepath = post_media_dir / filename
+                    downloads.setdefault(filepath, []).append(img_url)
 
-                    try:
-                        # print(f"    Downloading: {filename}")
-                        img_r = session.get(normalized_url, stream=True, timeout=10)
-                        if img_r.status_code == 200:
-                            with filepath.open("wb") as f:
-                                for chunk in img_r.iter_content(chunk_size=8192):
-                                    f.write(chunk)
-                            total_downloaded += 1
-                    except Exception as e:
-                        print(f"    Error downloading {normalized_url}: {e}")
+                # Posts may share a directory (duplicate or missing slugs), so
+                # target files are claimed run-wide and two downloads never
+                # write the same file at once
+                with self._claim_lock:
+                    downloads = {
+                        filepath: urls
+                        for filepath, urls in downloads.items()
+                        if filepath not in self._claimed
+                    }
+                    self._claimed.update(downloads)
 
-            time.sleep(delay)
+                return sum(
+                    self.download_pool.map(
+                        self.download_image, repeat(log), downloads.values(), downloads
+                    )
+                )
 
         except Exception as e:
-            print(f"  Error processing post: {e}")
+            log.append(f"  Error processing post: {e}")
+
+        return 0
+
+    def download_image(self, log, urls, filepath):
+        """
+        Downloads an image to filepath from the first of the candidate URLs
+        that succeeds, returns 1 if saved and 0 otherwise. Images whose
+        Content-Length exceeds max_bytes are skipped, unless max_bytes is None.
+        Messages are appended to the log of the post the image belongs to
+        """
+        for url in urls:
+            if self._stopped.is_set():
+                break
+            try:
+                # log.append(f"    Downloading: {filepath.name}")
+                # Closing the response hands its connection back to the pool
+                with (
+                    self.image_slots.for_url(url),
+                    self.session.get(url, stream=True, timeout=10) as img_r,
+                ):
+                    if img_r.status_code == 200:
+                        # The headers are in before the body is read, so an
+                        # oversized image costs no transfer
+                        size = int(img_r.headers.get("Content-Length", 0))
+                        if self.max_bytes is not None and size > self.max_bytes:
+                            log.append(f"    Skipping {url} ({size} bytes)")
+                            continue
+                        img_r.raw.decode_content = True
+                        with filepath.open("wb") as f:
+                            shutil.copyfileobj(img_r.raw, f, length=1 << 20)
+                        return 1
+            except Exception as e:
+                log.append(f"    Error downloading {url}: {e}")
+        # Release the claim so another post with the same target can retry it
+        with self._claim_lock:
+            self._claimed.discard(filepath)
+        return 0
+
+
+def canonical_url(url, base):
+    # Absolute URL without query string or fragment and with a lowercase
+    # scheme and host, so the same image is only fetched once per post.
+    # The file name is taken from the same parse, along with the URL
+    if url.startswith("//"):
+        url = "https:" + url
+    parts = urlparse(urljoin(base, url))
+    canonical = urlunparse(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, "", "", "")
+    )
+    return canonical, parts.path.rsplit("/", 1)[-1]
+
+
+def is_ngg_thumbnail_link(tag):
+    if "ngg-fancybox" in (tag.attrs.get("class") or ()):
+        return True
+    return (
+        tag.name == "a" and tag.find_parent(class_="ngg-gallery-thumbnail") is not None
+    )
 
-    print(f"Done. Downloaded {total_downloaded} new images.")
+
+def strip_thumbs(url):
+    # Clean up URL (remove query params for storage, but maybe keep for fetch? usually static)
+    # Often thumbnails have /thumbs/ in path, we want the full size.
+    # e.g. /wp-content/gallery/album-name/thumbs/thumbs_DSC.jpg
+    # full: /wp-content/gallery/album-name/DSC.jpg
+    if "/thumbs/" in url:
+        # Try to guess full size URL
+        return url.replace("/thumbs/thumbs_", "/").replace("/thumbs/", "/")
+    return url
 
 
 def is_image_url(url):
-    return re.search(r"\.(jpg|jpeg|png|gif|webp)$", url, re.IGNORECASE)
+    dot = url.rfind(".")
+    return dot != -1 and url[dot + 1 :].lower() in IMAGE_EXTENSIONS
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {value}")
+    return number
 
 
 if __name__ == "__main__":
@@ -134,8 +413,40 @@ if __name__ == "__main__":
     parser.add_argument("posts_json", help="Path to posts.json file")
     parser.add_argument("output_folder", help="Folder to save images")
     parser.add_argument(
-        "--delay", type=float, default=0.5, help="Delay between requests"
+        "--delay",
+        type=float,
+        default=0.5,
+        help=(
+            "Minimum delay in seconds between post page requests to the same "
+            "host; images are fetched without delay, at most "
+            f"{IMAGE_DOWNLOADS_PER_HOST} at a time per host"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=DEFAULT_JOBS,
+        help="Number of posts and images fetched concurrently",
+    )
+    parser.add_argument(
+        "--max-images-per-post",
+        type=non_negative_int,
+        default=0,
+        help="Download at most this many images per post (0 for no limit)",
+    )
+    parser.add_argument(
+        "--max-image-bytes",
+        type=non_negative_int,
+        default=None,
+        help="Skip images whose Content-Length exceeds this many bytes",
     )
 
     args = parser.parse_args()
-    scrape_ngg_images(args.posts_json, args.output_folder, args.delay)
+    scrape_ngg_images(
+        args.posts_json,
+        args.output_folder,
+        args.delay,
+        jobs=args.jobs,
+        max_bytes=args.max_image_bytes,
+        cap=args.max_images_per_post,
+    )